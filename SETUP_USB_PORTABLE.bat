@@ -25,7 +25,7 @@ set "SCRIPT_DIR=%~dp0"
 cd /d "%SCRIPT_DIR%"
 
 REM Check if Python is available for setup
-echo [STEP 1/5] Checking for Python to create portable setup...
+echo [STEP 1/4] Checking for Python to create portable setup...
 python --version >nul 2>&1
 if errorlevel 1 (
     echo.
@@ -43,7 +43,7 @@ if errorlevel 1 (
 echo       Python found!
 
 REM Create virtual environment
-echo [STEP 2/5] Creating virtual environment...
+echo [STEP 2/4] Creating virtual environment...
 if not exist "venv" (
     python -m venv venv
     if errorlevel 1 (
@@ -55,9 +55,9 @@ if not exist "venv" (
 echo       Virtual environment created!
 
 REM Activate and install packages
-echo [STEP 3/5] Installing Django and dependencies...
+echo [STEP 3/4] Installing Django and dependencies...
 call venv\Scripts\activate.bat
-pip install django matplotlib scikit-learn joblib numpy --quiet
+pip install django pillow numpy --quiet
 if errorlevel 1 (
     echo  ERROR: Failed to install packages!
     pause
@@ -66,15 +66,10 @@ if errorlevel 1 (
 echo       Packages installed!
 
 REM Run migrations
-echo [STEP 4/5] Setting up database...
+echo [STEP 4/4] Setting up database...
 python manage.py migrate --run-syncdb >nul 2>&1
 echo       Database ready!
 
-REM Create directories
-echo [STEP 5/5] Creating directories...
-if not exist "static\charts" mkdir static\charts
-echo       Directories created!
-
 echo.
 echo  ============================================
 echo   SETUP COMPLETE!
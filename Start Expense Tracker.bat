@@ -24,9 +24,6 @@ if not exist "venv\Scripts\python.exe" (
     exit /b 1
 )
 
-REM Create charts directory if not exists
-if not exist "static\charts" mkdir static\charts
-
 echo.
 echo  ============================================
 echo   EXPENSE TRACKER WITH AI PREDICTION
@@ -89,7 +89,7 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 
-# Media files (for generated charts)
+# Media files
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
@@ -97,7 +97,4 @@ MEDIA_ROOT = BASE_DIR / 'media'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # ML Model path
-ML_MODEL_PATH = BASE_DIR / 'ml_model.joblib'
-
-# Chart output directory
-CHART_DIR = BASE_DIR / 'static' / 'charts'
\ No newline at end of file
+ML_MODEL_PATH = BASE_DIR / 'ml_model.json'
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+Chart rendering for the Expense Tracker.
+
+This module draws the "Daily Expenses - Last 7 Days" bar chart with Pillow.
+
+A chart with only 7 bars does not need a full plotting library, so we
+draw the background, grid lines, bars and labels ourselves. This is much
+faster than building a Matplotlib figure on every request.
+"""
+
+import math
+from PIL import Image, ImageDraw, ImageFont
+
+
+# Chart size in pixels
+WIDTH = 1000
+HEIGHT = 500
+
+# Space around the plot area
+MARGIN_LEFT = 100
+MARGIN_TOP = 70
+MARGIN_RIGHT = 30
+MARGIN_BOTTOM = 80
+
+# Colors (same palette as the website)
+COLOR_BAR = '#6366F1'
+COLOR_TEXT = '#1E293B'
+COLOR_MUTED = '#64748B'
+COLOR_GRID = '#CBD5E1'
+COLOR_AXIS = '#E2E8F0'
+COLOR_PLOT_BG = '#F8FAFC'
+COLOR_BG = '#FFFFFF'
+
+# Fonts to try, in order (Linux, Windows)
+FONT_REGULAR = ('DejaVuSans.ttf', 'segoeui.ttf', 'arial.ttf')
+FONT_BOLD = ('DejaVuSans-Bold.ttf', 'segoeuib.ttf', 'arialbd.ttf')
+
+
+def _load_font(names, size):
+    """Load the first available TrueType font, or Pillow's built-in font."""
+    for name in names:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default(size)
+
+
+def _nice_step(max_value, ticks=5):
+    """Return a round grid step (1, 2, 2.5 or 5 times a power of 10)."""
+    raw = max_value / ticks
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for factor in (1, 2, 2.5, 5, 10):
+        if raw <= factor * magnitude:
+            return factor * magnitude
+    return 10 * magnitude
+
+
+def render_daily_chart(dates, amounts, fp):
+    """
+    Draw the daily expenses bar chart and save it as a PNG.
+
+    Args:
+        dates: List of dates, one per bar
+        amounts: List of amounts spent on each date
+        fp: File path or binary file object to write the PNG to
+    """
+    font = _load_font(FONT_REGULAR, 13)
+    font_label = _load_font(FONT_BOLD, 15)
+    font_title = _load_font(FONT_BOLD, 18)
+
+    img = Image.new('RGB', (WIDTH, HEIGHT), COLOR_BG)
+    draw = ImageDraw.Draw(img)
+
+    # Plot area
+    left, top = MARGIN_LEFT, MARGIN_TOP
+    right, bottom = WIDTH - MARGIN_RIGHT, HEIGHT - MARGIN_BOTTOM
+    draw.rectangle([left, top, right, bottom], fill=COLOR_PLOT_BG)
+
+    # Y-axis scale, with some headroom above the tallest bar for its label
+    top_value = max(max(amounts, default=0) * 1.15, 1)
+    step = _nice_step(top_value)
+    y_max = step * math.ceil(top_value / step)
+
+    def y_pos(value):
+        return bottom - (value / y_max) * (bottom - top)
+
+    # Horizontal grid lines with amount labels
+    value = 0
+    while value <= y_max:
+        y = y_pos(value)
+        if value > 0:
+            for x in range(left, right, 8):
+                draw.line([(x, y), (min(x + 4, right), y)], fill=COLOR_GRID)
+        draw.text((left - 8, y), f'{value:,.0f}', font=font, fill=COLOR_MUTED, anchor='rm')
+        value += step
+
+    # Axes (left and bottom only)
+    draw.line([(left, top), (left, bottom)], fill=COLOR_AXIS, width=2)
+    draw.line([(left, bottom), (right, bottom)], fill=COLOR_AXIS, width=2)
+
+    # Bars with date labels below and amount labels above
+    slot = (right - left) / len(amounts)
+    bar_width = slot * 0.8
+    for i, (date, amount) in enumerate(zip(dates, amounts)):
+        x0 = left + i * slot + (slot - bar_width) / 2
+        x1 = x0 + bar_width
+        center = (x0 + x1) / 2
+
+        if amount > 0:
+            y = y_pos(amount)
+            draw.rectangle([x0, y, x1, bottom], fill=COLOR_BAR, outline=COLOR_BG)
+            draw.text((center, y - 4), f'₱{amount:,.0f}', font=font, fill=COLOR_TEXT, anchor='mb')
+
+        draw.text((center, bottom + 8), date.strftime('%b %d'), font=font, fill=COLOR_MUTED, anchor='mt')
+
+    # Title and axis labels
+    draw.text((WIDTH / 2, top / 2), 'Daily Expenses - Last 7 Days',
+              font=font_title, fill=COLOR_TEXT, anchor='mm')
+    draw.text(((left + right) / 2, HEIGHT - 20), 'Date',
+              font=font_label, fill=COLOR_TEXT, anchor='mm')
+
+    # Vertical y-axis label: draw it on its own image, then rotate it
+    label = 'Amount (₱)'
+    box = draw.textbbox((0, 0), label, font=font_label)
+    label_img = Image.new('RGB', (box[2] + 4, box[3] + 4), COLOR_BG)
+    ImageDraw.Draw(label_img).text((2, 2), label, font=font_label, fill=COLOR_TEXT)
+    label_img = label_img.rotate(90, expand=True)
+    img.paste(label_img, (14, int((top + bottom - label_img.height) / 2)))
+
+    img.save(fp, 'PNG', optimize=True)
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-15 20:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['-date', '-created_at'], name='expenses_ex_date_840b41_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['date', 'category'], name='expenses_ex_date_39ea19_idx'),
+        ),
+    ]
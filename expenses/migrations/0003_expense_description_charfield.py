@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-15 20:56
+
+from django.db import migrations, models
+
+
+def fill_empty_descriptions(apps, schema_editor):
+    """Replace NULL descriptions with '' and shorten any longer than 255 characters."""
+    Expense = apps.get_model('expenses', 'Expense')
+    Expense.objects.filter(description__isnull=True).update(description='')
+    for expense in Expense.objects.filter(description__regex=r'^.{256,}'):
+        expense.description = expense.description[:255]
+        expense.save(update_fields=['description'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0002_expense_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_empty_descriptions, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='expense',
+            name='description',
+            field=models.CharField(blank=True, default='', help_text='Optional description or notes', max_length=255),
+        ),
+    ]
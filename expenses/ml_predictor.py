@@ -16,61 +16,155 @@ higher spending tomorrow.
 """
 
 import os
-from datetime import datetime, timedelta
-from decimal import Decimal
-import numpy as np
+import copy
+import json
+import tempfile
+import threading
 from django.conf import settings
-from django.db.models import Sum
-from django.db.models.functions import TruncDate
+from django.db.models import Sum, Count
 
 # Import ML libraries
 try:
-    from sklearn.linear_model import LinearRegression
-    import joblib
+    import numpy as np
     ML_AVAILABLE = True
 except ImportError:
     ML_AVAILABLE = False
-    print("Warning: scikit-learn not installed. ML features disabled.")
+    print("Warning: NumPy not installed. ML features disabled.")
+
+
+# Serializes update() within one process (e.g. runserver threads)
+_update_lock = threading.Lock()
+
+
+def _running_sums(x, y):
+    """Return the sums used by the least squares formulas (Σx, Σy, Σxy, Σx²)."""
+    return {
+        'sx': float(x.sum()),
+        'sy': float(y.sum()),
+        'sxy': float((x * y).sum()),
+        'sxx': float((x * x).sum()),
+    }
+
+
+def _fit_line(n, sums):
+    """
+    Compute the best fit line y = m*x + b from the running sums.
+    
+    Uses the closed-form least squares formulas:
+        m = (n*Σxy - Σx*Σy) / (n*Σx² - (Σx)²)
+        b = (Σy - m*Σx) / n
+    
+    Returns:
+        tuple: (m, b)
+    """
+    if n == 0:
+        return 0.0, 0.0
+    
+    denominator = n * sums['sxx'] - sums['sx'] * sums['sx']
+    if denominator == 0:
+        # Only one day of data, so the best we can do is a flat line
+        return 0.0, sums['sy'] / n
+    
+    m = (n * sums['sxy'] - sums['sx'] * sums['sy']) / denominator
+    b = (sums['sy'] - m * sums['sx']) / n
+    return m, b
 
 
 class ExpensePredictor:
     """
     A simple expense predictor using Linear Regression.
     
+    The regression line is fitted with the closed-form least squares
+    formulas in NumPy, so the model is just a slope (m) and intercept (b).
+    The model also keeps the running sums and daily totals it was fitted
+    from, so new expenses can be added with update() without retraining.
+    
     This class:
     - Trains a model on historical expense data
-    - Saves the trained model to a file (.joblib)
+    - Saves the trained model to a small JSON file
     - Loads the model to make predictions
     - Predicts tomorrow's expected spending
     """
     
+    # Last loaded model, shared by all instances, and the file it came from.
+    # The file is only read again when its modification time changes.
+    _cached_model = None
+    _cached_path = None
+    _cached_mtime = 0
+    
     def __init__(self):
         """Initialize the predictor with the model path from settings."""
-        self.model_path = getattr(settings, 'ML_MODEL_PATH', 'ml_model.joblib')
+        self.model_path = getattr(settings, 'ML_MODEL_PATH', 'ml_model.json')
         self.model = None
         self._load_model()
     
     def _load_model(self):
-        """Load the trained model from file if it exists."""
+        """Load the trained model from file if it exists (cached by file mtime)."""
         if not ML_AVAILABLE:
             return
-            
-        if os.path.exists(self.model_path):
-            try:
-                self.model = joblib.load(self.model_path)
-            except Exception as e:
-                print(f"Error loading model: {e}")
-                self.model = None
+        
+        cls = type(self)
+        try:
+            mtime = os.stat(self.model_path).st_mtime_ns
+        except FileNotFoundError:
+            self.model = None
+            return
+        
+        if mtime == cls._cached_mtime and self.model_path == cls._cached_path:
+            self.model = cls._cached_model
+            return
+        
+        try:
+            with open(self.model_path) as f:
+                self.model = json.load(f)
+        except Exception as e:
+            print(f"Error loading model: {e}")
+            self.model = None
+            return
+        
+        self._remember_model(mtime)
+    
+    def _remember_model(self, mtime):
+        """Store the current model in the class-level cache."""
+        cls = type(self)
+        cls._cached_model = self.model
+        cls._cached_path = self.model_path
+        cls._cached_mtime = mtime
     
     def _save_model(self):
-        """Save the trained model to file."""
+        """
+        Save the trained model to file.
+        
+        The model is written to a temporary file that then replaces the
+        model file, so other processes never read a half-written model.
+        """
         if not ML_AVAILABLE or self.model is None:
             return
-            
+        
+        tmp_path = None
         try:
-            joblib.dump(self.model, self.model_path)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(self.model_path)), suffix='.tmp'
+            )
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.model, f)
+            os.replace(tmp_path, self.model_path)
+            tmp_path = None
+            self._remember_model(os.stat(self.model_path).st_mtime_ns)
         except Exception as e:
             print(f"Error saving model: {e}")
+        finally:
+            if tmp_path is not None:
+                os.remove(tmp_path)
+    
+    def reset(self):
+        """Forget the trained model and delete its file, so it is retrained on next use."""
+        self.model = None
+        type(self)._cached_model = None
+        try:
+            os.remove(self.model_path)
+        except FileNotFoundError:
+            pass
     
     def train(self, expenses_queryset):
         """
@@ -90,55 +184,87 @@ class ExpensePredictor:
             }
         
         # Group expenses by date and sum the amounts
-        # Using simple values and grouping to avoid TruncDate issues with SQLite
+        # (date is a DateField, so grouping on it directly gives one row per day)
         daily_totals = (
             expenses_queryset
             .values('date')
-            .annotate(total=Sum('amount'))
+            .annotate(total=Sum('amount'), count=Count('id'))
             .order_by('date')
         )
         
-        # Convert to list for processing
-        data = [{'expense_date': d['date'], 'total': d['total']} for d in daily_totals]
+        # Count the days first, so the totals can be streamed straight
+        # into a preallocated array instead of a list of rows
+        n = daily_totals.count()
         
-        if len(data) < 2:
+        # Prepare training data
+        # x = day number (0, 1, 2, ...)
+        # y = total amount spent that day
+        y = np.empty(n, dtype=np.float64)
+        daily = {}
+        i = 0
+        rows = daily_totals.values_list('date', 'total', 'count')
+        for date, total, count in rows.iterator(chunk_size=1000):
+            if i == n:
+                break  # Days were added after counting
+            y[i] = float(total)
+            daily[date.isoformat()] = [i, y[i].item(), count]
+            if i == 0:
+                first_date = date
+            last_date = date
+            i += 1
+        
+        # Days may have been removed after counting
+        n = i
+        
+        if n < 2:
             return {
                 'success': False,
                 'error': 'Not enough data to train. Need at least 2 days of expenses.',
                 'prediction': None,
-                'data_points': len(data)
+                'data_points': n
             }
         
-        # Prepare training data
-        # X = day number (1, 2, 3, ...)
-        # y = total amount spent that day
-        X = np.array(range(len(data))).reshape(-1, 1)
-        y = np.array([float(d['total']) for d in data])
+        y = y[:n]
+        x = np.arange(n, dtype=np.float64)
         
-        # Create and train the model
-        self.model = LinearRegression()
-        self.model.fit(X, y)
+        # Fit the best fit line y = m*x + b
+        sums = _running_sums(x, y)
+        m, b = _fit_line(n, sums)
+        self.model = {
+            'm': m,
+            'b': b,
+            'n': n,
+            'sums': sums,
+            # Day number, total and expense count for each date, used by update()
+            'daily': daily,
+            'last': last_date.isoformat(),
+        }
         
         # Save the trained model
         self._save_model()
         
         # Calculate R² score (how well the model fits the data)
-        r2_score = self.model.score(X, y)
+        ss_res = ((y - (m * x + b)) ** 2).sum()
+        ss_tot = ((y - y.mean()) ** 2).sum()
+        if ss_tot > 0:
+            r2_score = 1 - ss_res / ss_tot
+        else:
+            # All days have the same total, so the line fits perfectly
+            r2_score = 1.0
         
         # Predict tomorrow (next day after the last data point)
-        next_day = np.array([[len(data)]]).reshape(-1, 1)
-        prediction = max(0, self.model.predict(next_day)[0])  # Can't be negative
+        prediction = max(0, m * n + b)  # Can't be negative
         
         return {
             'success': True,
-            'prediction': round(prediction, 2),
-            'r2_score': round(r2_score, 4),
-            'data_points': len(data),
-            'trend': 'increasing' if self.model.coef_[0] > 0 else 'decreasing',
-            'daily_change': round(float(self.model.coef_[0]), 2),
+            'prediction': round(float(prediction), 2),
+            'r2_score': round(float(r2_score), 4),
+            'data_points': n,
+            'trend': 'increasing' if m > 0 else 'decreasing',
+            'daily_change': round(float(m), 2),
             'dates_range': {
-                'start': data[0]['expense_date'],
-                'end': data[-1]['expense_date']
+                'start': first_date,
+                'end': last_date
             }
         }
     
@@ -165,34 +291,110 @@ class ExpensePredictor:
                 'prediction': None
             }
         
-        # Get the number of days in the dataset
-        daily_totals = (
-            expenses_queryset
-            .values('date')
-            .annotate(total=Sum('amount'))
-            .order_by('date')
-        )
-        
-        data = [{'expense_date': d['date'], 'total': d['total']} for d in daily_totals]
-        
-        if len(data) < 1:
-            return {
-                'success': False,
-                'error': 'No expense data available',
-                'prediction': None
-            }
+        # Number of days the model was fitted on (the next day is day n)
+        num_days = self.model['n']
         
         # Predict for the next day
-        next_day = np.array([[len(data)]]).reshape(-1, 1)
-        prediction = max(0, self.model.predict(next_day)[0])
+        prediction = max(0, self.model['m'] * num_days + self.model['b'])
         
         return {
             'success': True,
             'prediction': round(prediction, 2),
-            'data_points': len(data),
+            'data_points': num_days,
             'model_loaded': True
         }
     
+    def update(self, date, amount, count):
+        """
+        Add (or remove) expenses on one day without retraining the model.
+        
+        Changing the total of a day that is already in the model, or adding
+        a day after the last one, only updates the running sums. Adding a
+        day in the middle, or removing a day completely, renumbers the days
+        from the stored daily totals. A day is removed once it has no
+        expenses left, whatever its total is, the same way train() groups
+        the expenses.
+        
+        Each update reads the newest saved model and saves it again. Updates
+        in one process are serialized, but two worker processes (gunicorn)
+        saving at the same moment can still lose one of the changes. The
+        model then drifts from the data until it is retrained, for example
+        by clearing the data or deleting ml_model.json.
+        
+        Args:
+            date: Date of the expenses
+            amount: Amount to add to that day (negative to remove)
+            count: Number of expenses added to that day (negative to remove)
+        """
+        with _update_lock:
+            # Start from the newest saved model, which another process may have changed
+            self._load_model()
+            self._update(date, amount, count)
+    
+    def _update(self, date, amount, count):
+        """Apply one update() to the model and save it (caller holds the lock)."""
+        if not ML_AVAILABLE or self.model is None or 'daily' not in self.model:
+            return
+        
+        # Work on a copy: the loaded model is shared through the class-level
+        # cache, which should only change once the new model is saved
+        self.model = copy.deepcopy(self.model)
+        daily = self.model['daily']
+        sums = self.model['sums']
+        key = date.isoformat()
+        amount = float(amount)
+        
+        if key in daily:
+            x, total, day_count = daily[key]
+            if day_count + count > 0:
+                # Same day number, only y changes
+                daily[key] = [x, total + amount, day_count + count]
+                sums['sy'] += amount
+                sums['sxy'] += x * amount
+            else:
+                # The day has no expenses left, so later days shift down
+                del daily[key]
+                self._renumber_days()
+        elif count <= 0:
+            return
+        elif self.model['last'] is None or key > self.model['last']:
+            # New day after the last one gets the next day number
+            x = self.model['n']
+            daily[key] = [x, amount, count]
+            self.model['n'] = x + 1
+            self.model['last'] = key
+            sums['sx'] += x
+            sums['sy'] += amount
+            sums['sxy'] += x * amount
+            sums['sxx'] += x * x
+        else:
+            # New day in the middle of the history
+            daily[key] = [0, amount, count]
+            self._renumber_days()
+        
+        if self.model['n'] < 2:
+            # Too few days left for a trend line; retrain on the next prediction
+            self.reset()
+            return
+        
+        self.model['m'], self.model['b'] = _fit_line(self.model['n'], self.model['sums'])
+        self._save_model()
+    
+    def _renumber_days(self):
+        """Number the stored days in date order and recompute the running sums."""
+        daily = self.model['daily']
+        dates = sorted(daily)
+        n = len(dates)
+        
+        for i, key in enumerate(dates):
+            daily[key][0] = i
+        
+        x = np.arange(n, dtype=np.float64)
+        y = np.fromiter((daily[key][1] for key in dates), dtype=np.float64, count=n)
+        self.model['n'] = n
+        self.model['sums'] = _running_sums(x, y)
+        self.model['last'] = dates[-1] if dates else None
+    
     def get_model_info(self):
         """
         Get information about the current model.
@@ -216,12 +418,33 @@ class ExpensePredictor:
         return {
             'available': True,
             'trained': True,
-            'coefficient': round(float(self.model.coef_[0]), 4),
-            'intercept': round(float(self.model.intercept_), 4),
+            'coefficient': round(self.model['m'], 4),
+            'intercept': round(self.model['b'], 4),
             'model_path': str(self.model_path)
         }
 
 
+# Shared predictor instance, so the model file is only read once per process
+_predictor_singleton = None
+
+
+def get_predictor():
+    """
+    Return the shared ExpensePredictor instance.
+    
+    Creating an ExpensePredictor loads the model from disk, so views should
+    use this instead of instantiating the class on every request.
+    """
+    global _predictor_singleton
+    if _predictor_singleton is None:
+        _predictor_singleton = ExpensePredictor()
+    else:
+        # Pick up a model saved by another process; this is only a stat()
+        # call unless the file has changed
+        _predictor_singleton._load_model()
+    return _predictor_singleton
+
+
 def get_prediction_explanation():
     """
     Return a simple explanation of how the prediction works.
@@ -9,9 +9,27 @@ This model stores all expense records with:
 """
 
 from django.db import models
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
 from django.utils import timezone
 
 
+# Emoji and plain name for each category (shared by the model and views)
+CATEGORY_EMOJI = {
+    'food': '🍔',
+    'transport': '🚗',
+    'bills': '💡',
+    'other': '📦',
+}
+
+CATEGORY_NAME = {
+    'food': 'Food',
+    'transport': 'Transport',
+    'bills': 'Bills',
+    'other': 'Other',
+}
+
+
 class Expense(models.Model):
     """
     Expense Model
@@ -50,10 +68,12 @@ class Expense(models.Model):
         help_text="Date of the expense"
     )
     
-    # Description field - optional notes about the expense
-    description = models.TextField(
+    # Description field - optional short notes about the expense
+    # (empty string when not given, never NULL)
+    description = models.CharField(
+        max_length=255,
         blank=True,
-        null=True,
+        default='',
         help_text="Optional description or notes"
     )
     
@@ -66,6 +86,12 @@ class Expense(models.Model):
     class Meta:
         """Meta options for the Expense model."""
         ordering = ['-date', '-created_at']  # Most recent first
+        indexes = [
+            # Matches the default ordering used by the expense list
+            models.Index(fields=['-date', '-created_at']),
+            # Date range filters and per-day/per-category grouping
+            models.Index(fields=['date', 'category']),
+        ]
         verbose_name = 'Expense'
         verbose_name_plural = 'Expenses'
     
@@ -76,21 +102,48 @@ class Expense(models.Model):
     @property
     def category_emoji(self):
         """Return just the emoji for the category."""
-        emoji_map = {
-            'food': '🍔',
-            'transport': '🚗',
-            'bills': '💡',
-            'other': '📦',
-        }
-        return emoji_map.get(self.category, '📦')
+        return CATEGORY_EMOJI.get(self.category, '📦')
     
     @property
     def category_name(self):
         """Return just the name for the category (without emoji)."""
-        name_map = {
-            'food': 'Food',
-            'transport': 'Transport',
-            'bills': 'Bills',
-            'other': 'Other',
-        }
-        return name_map.get(self.category, 'Other')
\ No newline at end of file
+        return CATEGORY_NAME.get(self.category, 'Other')
+
+
+@receiver(pre_save, sender=Expense)
+def remember_saved_values(sender, instance, **kwargs):
+    """Keep the stored date and amount of an edited expense for the ML model update."""
+    instance._previous_values = None
+    if instance.pk is not None:
+        instance._previous_values = (
+            Expense.objects.filter(pk=instance.pk).values_list('date', 'amount').first()
+        )
+
+
+@receiver(post_save, sender=Expense)
+def add_expense_to_model(sender, instance, created, **kwargs):
+    """Apply a new or edited expense to the trained ML model without retraining it."""
+    from .ml_predictor import get_predictor
+    predictor = get_predictor()
+    date = Expense._meta.get_field('date').to_python(instance.date)
+    amount = Expense._meta.get_field('amount').to_python(instance.amount)
+    previous = getattr(instance, '_previous_values', None)
+    
+    if previous is None:
+        predictor.update(date, amount, 1)
+    elif previous[0] == date:
+        if previous[1] != amount:
+            predictor.update(date, amount - previous[1], 0)
+    else:
+        # Moved to another day: add to the new day first, so the model never
+        # drops below two days in between
+        predictor.update(date, amount, 1)
+        predictor.update(previous[0], -previous[1], -1)
+
+
+@receiver(post_delete, sender=Expense)
+def remove_expense_from_model(sender, instance, **kwargs):
+    """Remove a deleted expense from the trained ML model."""
+    from .ml_predictor import get_predictor
+    date = Expense._meta.get_field('date').to_python(instance.date)
+    get_predictor().update(date, -instance.amount, -1)
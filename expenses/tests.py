@@ -0,0 +1,123 @@
+"""
+Tests for the Expense Tracker.
+
+The ML model is kept up to date by update() from the model signals instead
+of being retrained on every change. These tests check that every kind of
+change leaves the model with the same line as a full retrain would.
+"""
+
+import os
+import shutil
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+
+from . import ml_predictor
+from .ml_predictor import ExpensePredictor, get_predictor
+from .models import Expense
+
+
+START = date(2026, 1, 1)
+
+
+def day(i):
+    """Return the date i days after the first test day."""
+    return START + timedelta(days=i)
+
+
+class IncrementalModelTests(TestCase):
+    """The incrementally updated model must match a model trained from scratch."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.model_path = os.path.join(self.tmpdir, 'ml_model.json')
+        settings_override = override_settings(ML_MODEL_PATH=self.model_path)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+        # Start every test without a shared predictor or cached model
+        ml_predictor._predictor_singleton = None
+        ExpensePredictor._cached_model = None
+        ExpensePredictor._cached_path = None
+        ExpensePredictor._cached_mtime = 0
+        self.addCleanup(setattr, ml_predictor, '_predictor_singleton', None)
+
+    def add(self, i, amount):
+        """Save an expense on test day i."""
+        return Expense.objects.create(amount=Decimal(amount), date=day(i))
+
+    def train_on(self, amounts):
+        """Save one expense per day with the given amounts and train the model."""
+        for i, amount in enumerate(amounts):
+            self.add(i, amount)
+        result = get_predictor().train(Expense.objects.all())
+        self.assertTrue(result['success'])
+
+    def assertMatchesRetrain(self):
+        """Check that the current model has the same line as a full retrain."""
+        model = get_predictor().model
+        self.assertIsNotNone(model)
+
+        # Train the reference model into its own file, so the shared one is untouched
+        reference = ExpensePredictor()
+        reference.model_path = os.path.join(self.tmpdir, 'reference.json')
+        reference.train(Expense.objects.all())
+
+        self.assertEqual(model['n'], reference.model['n'])
+        self.assertAlmostEqual(model['m'], reference.model['m'])
+        self.assertAlmostEqual(model['b'], reference.model['b'])
+
+    def test_new_day_after_last(self):
+        self.train_on(['10', '20', '15'])
+        self.add(3, '40')
+        self.assertMatchesRetrain()
+
+    def test_change_on_existing_day(self):
+        self.train_on(['10', '20', '15'])
+        self.add(1, '5')
+        expense = Expense.objects.get(date=day(2))
+        expense.amount = Decimal('35')
+        expense.save()
+        self.assertMatchesRetrain()
+
+    def test_new_day_in_middle(self):
+        self.train_on(['10', '20', '15'])
+        self.add(5, '30')
+        self.add(4, '12')
+        self.assertMatchesRetrain()
+
+    def test_remove_whole_day(self):
+        self.train_on(['10', '20', '15', '30'])
+        Expense.objects.get(date=day(1)).delete()
+        self.assertMatchesRetrain()
+
+    def test_move_to_another_day(self):
+        self.train_on(['10', '20', '15', '30'])
+        expense = Expense.objects.get(date=day(1))
+        expense.date = day(6)
+        expense.amount = Decimal('25')
+        expense.save()
+        self.assertMatchesRetrain()
+
+    def test_zero_and_negative_amounts(self):
+        # The admin does not use the form's amount check
+        self.train_on(['10', '20', '15', '30', '25'])
+        self.add(7, '0')
+        self.add(2, '-15')
+        self.assertMatchesRetrain()
+        self.assertEqual(get_predictor().model['n'], 6)
+
+    def test_reset_below_two_days(self):
+        self.train_on(['10', '20'])
+        Expense.objects.get(date=day(0)).delete()
+        self.assertIsNone(get_predictor().model)
+        self.assertFalse(os.path.exists(self.model_path))
+
+        # The next prediction retrains on the new data
+        self.add(3, '40')
+        result = get_predictor().predict_next_day(Expense.objects.all())
+        self.assertTrue(result['success'])
+        self.assertEqual(result['data_points'], 2)
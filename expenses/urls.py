@@ -5,6 +5,7 @@ This module defines all the URL patterns for the expense tracker:
 - / : Home page (expense list/dashboard)
 - /add/ : Add new expense
 - /graph/ : View expense charts
+- /chart.png : Weekly expense chart image
 - /predict/ : AI spending prediction
 - /sample/ : Populate sample data
 - /clear/ : Clear all data
@@ -24,6 +25,9 @@ urlpatterns = [
     # View expense graph/chart
     path('graph/', views.expense_graph, name='expense_graph'),
     
+    # Weekly chart image (rendered in memory)
+    path('chart.png', views.chart_png, name='expense_chart'),
+    
     # AI prediction page
     path('predict/', views.expense_prediction, name='expense_prediction'),
     
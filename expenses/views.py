@@ -9,25 +9,27 @@ This module contains all the view functions that handle:
 - Populating sample data
 """
 
-import os
-from datetime import datetime, timedelta
+import io
+from datetime import timedelta
 from decimal import Decimal
 from django.shortcuts import render, redirect
+from django.urls import reverse
 from django.contrib import messages
-from django.db.models import Sum, Count
-from django.db.models.functions import TruncDate
-from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum, Count, Q, Min, Max
 from django.http import HttpResponse
+from django.utils import timezone
+from django.core.cache import cache
 
-from .models import Expense
+from .models import (
+    Expense, CATEGORY_EMOJI, CATEGORY_NAME,
+)
 from .forms import ExpenseForm
-from .ml_predictor import ExpensePredictor, get_prediction_explanation
+from .ml_predictor import ML_AVAILABLE, get_predictor, get_prediction_explanation
 
-# Import Matplotlib for chart generation
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend for server
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+# Cache keys for the dashboard prediction and the rendered weekly chart PNG
+PREDICTION_CACHE_KEY = 'expense_predictor_next_day'
+CHART_CACHE_KEY = 'chart:week'
 
 
 def expense_list(request):
@@ -41,34 +43,51 @@ def expense_list(request):
     # Get all expenses
     expenses = Expense.objects.all()
     
-    # Calculate totals for summary cards
-    total_expenses = expenses.aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-    
-    # This week's expenses
-    today = datetime.now().date()
+    # This week's total, the expense count and the last change in a single query
+    today = timezone.localdate()
     week_start = today - timedelta(days=today.weekday())
-    week_expenses = expenses.filter(date__gte=week_start).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-    
-    # Get prediction for tomorrow
-    predictor = ExpensePredictor()
-    prediction_result = predictor.predict_next_day(expenses)
+    stats = expenses.aggregate(
+        week=Sum('amount', filter=Q(date__gte=week_start)),
+        cnt=Count('id'),
+        updated=Max('updated_at'),
+    )
+    week_expenses = stats['week'] or Decimal('0.00')
+    
+    # Get prediction for tomorrow. The cache key is built from the data, so
+    # any add, edit or delete (in any worker process) gives a new key; the
+    # count is included so that deletions change it too. The last change is
+    # a timestamp, since cache keys must not contain spaces.
+    updated = stats['updated'].timestamp() if stats['updated'] else 0
+    prediction_result = cache.get_or_set(
+        f"{PREDICTION_CACHE_KEY}:{stats['cnt']}:{updated}",
+        lambda: get_predictor().predict_next_day(Expense.objects.all()),
+        3600,
+    )
     predicted_amount = prediction_result.get('prediction', 0) if prediction_result.get('success') else None
     
-    # Category breakdown
-    category_totals = (
+    # Category breakdown (materialized once; the grand total is summed from it)
+    category_totals = list(
         expenses
         .values('category')
         .annotate(total=Sum('amount'), count=Count('id'))
         .order_by('-total')
     )
+    total_expenses = sum((cat['total'] for cat in category_totals), Decimal('0.00'))
+    
+    # Last 20 expenses, loading only the columns the table shows
+    expenses_for_display = (
+        Expense.objects
+        .only('id', 'date', 'category', 'amount', 'description')
+        .order_by('-date', '-created_at')[:20]
+    )
     
     context = {
-        'expenses': expenses[:20],  # Show last 20 expenses
+        'expenses': expenses_for_display,
         'total_expenses': total_expenses,
         'week_expenses': week_expenses,
         'predicted_amount': predicted_amount,
         'category_totals': category_totals,
-        'expense_count': expenses.count(),
+        'expense_count': stats['cnt'],
     }
     
     return render(request, 'expense_list.html', context)
@@ -91,7 +110,7 @@ def expense_add(request):
             messages.error(request, 'Please correct the errors below.')
     else:
         # Pre-fill with today's date
-        form = ExpenseForm(initial={'date': datetime.now().date()})
+        form = ExpenseForm(initial={'date': timezone.localdate()})
     
     context = {
         'form': form,
@@ -103,79 +122,16 @@ def expense_add(request):
 
 def expense_graph(request):
     """
-    Generate and display expense charts.
+    Display the expense charts page.
     
-    Creates:
-    - Bar chart showing daily expenses for the last 7 days
+    Shows:
+    - Bar chart showing daily expenses for the last 7 days (served by chart_png)
     - Category breakdown summary
     """
-    # Ensure chart directory exists
-    chart_dir = settings.CHART_DIR
-    os.makedirs(chart_dir, exist_ok=True)
-    
     # Get expenses for the last 7 days
-    today = datetime.now().date()
+    today = timezone.localdate()
     week_ago = today - timedelta(days=6)
     
-    # Get daily totals - using simple date field instead of TruncDate for SQLite compatibility
-    daily_expenses = (
-        Expense.objects
-        .filter(date__gte=week_ago, date__lte=today)
-        .values('date')
-        .annotate(total=Sum('amount'))
-        .order_by('date')
-    )
-    
-    # Prepare data for all 7 days (including days with no expenses)
-    date_totals = {d['date']: float(d['total']) for d in daily_expenses}
-    
-    dates = []
-    amounts = []
-    for i in range(7):
-        date = week_ago + timedelta(days=i)
-        dates.append(date)
-        amounts.append(date_totals.get(date, 0))
-    
-    # Create the bar chart
-    fig, ax = plt.subplots(figsize=(10, 5))
-    
-    # Style the chart
-    colors = ['#6366F1' if amt > 0 else '#E2E8F0' for amt in amounts]
-    bars = ax.bar(dates, amounts, color=colors, edgecolor='white', linewidth=1)
-    
-    # Customize the chart
-    ax.set_xlabel('Date', fontsize=12, fontweight='bold', color='#1E293B')
-    ax.set_ylabel('Amount (₱)', fontsize=12, fontweight='bold', color='#1E293B')
-    ax.set_title('Daily Expenses - Last 7 Days', fontsize=14, fontweight='bold', color='#1E293B', pad=20)
-    
-    # Format x-axis dates
-    ax.xaxis.set_major_formatter(mdates.DateFormatter('%b %d'))
-    ax.xaxis.set_major_locator(mdates.DayLocator())
-    plt.xticks(rotation=45, ha='right')
-    
-    # Add value labels on bars
-    for bar, amount in zip(bars, amounts):
-        if amount > 0:
-            ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 10,
-                   f'₱{amount:,.0f}', ha='center', va='bottom', fontsize=9, color='#1E293B')
-    
-    # Style the chart background
-    ax.set_facecolor('#F8FAFC')
-    fig.patch.set_facecolor('#FFFFFF')
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.spines['left'].set_color('#E2E8F0')
-    ax.spines['bottom'].set_color('#E2E8F0')
-    ax.tick_params(colors='#64748B')
-    ax.yaxis.grid(True, linestyle='--', alpha=0.3, color='#CBD5E1')
-    
-    plt.tight_layout()
-    
-    # Save the chart
-    chart_path = os.path.join(chart_dir, 'daily_expenses.png')
-    plt.savefig(chart_path, dpi=100, bbox_inches='tight', facecolor='white')
-    plt.close()
-    
     # Get category breakdown
     category_totals = (
         Expense.objects
@@ -187,22 +143,19 @@ def expense_graph(request):
     
     # Add emoji to categories
     category_data = []
-    emoji_map = {'food': '🍔', 'transport': '🚗', 'bills': '💡', 'other': '📦'}
-    name_map = {'food': 'Food', 'transport': 'Transport', 'bills': 'Bills', 'other': 'Other'}
-    
     for cat in category_totals:
         category_data.append({
-            'name': name_map.get(cat['category'], 'Other'),
-            'emoji': emoji_map.get(cat['category'], '📦'),
+            'name': CATEGORY_NAME.get(cat['category'], 'Other'),
+            'emoji': CATEGORY_EMOJI.get(cat['category'], '📦'),
             'total': cat['total'],
             'count': cat['count'],
         })
     
     # Calculate week total
-    week_total = sum(amounts)
+    week_total = sum((cat['total'] for cat in category_data), Decimal('0.00'))
     
     context = {
-        'chart_url': '/static/charts/daily_expenses.png',
+        'chart_url': reverse('expense_chart'),
         'category_data': category_data,
         'week_total': week_total,
         'date_range': f"{week_ago.strftime('%b %d')} - {today.strftime('%b %d, %Y')}",
@@ -211,6 +164,57 @@ def expense_graph(request):
     return render(request, 'expense_graph.html', context)
 
 
+def chart_png(request):
+    """
+    Return the daily expenses bar chart for the last 7 days as a PNG.
+    
+    The image is rendered in memory and kept in the cache together with a
+    key describing its data, so it is only redrawn when that data changes.
+    """
+    today = timezone.localdate()
+    week_ago = today - timedelta(days=6)
+    
+    # The row count is part of the key so that deletions also invalidate it
+    window = (
+        Expense.objects
+        .filter(date__gte=week_ago, date__lte=today)
+        .aggregate(v=Max('updated_at'), cnt=Count('id'))
+    )
+    chart_key = f"{week_ago}:{today}:{window['v']}:{window['cnt']}"
+    
+    cached = cache.get(CHART_CACHE_KEY)
+    if cached is not None and cached[0] == chart_key:
+        return HttpResponse(cached[1], content_type='image/png')
+    
+    # Get daily totals (date is a DateField, so no truncation is needed)
+    daily_expenses = (
+        Expense.objects
+        .filter(date__gte=week_ago, date__lte=today)
+        .values('date')
+        .annotate(total=Sum('amount'))
+        .order_by('date')
+    )
+    
+    # Prepare data for all 7 days (including days with no expenses)
+    date_totals = {d['date']: float(d['total']) for d in daily_expenses}
+    
+    dates = []
+    amounts = []
+    for i in range(7):
+        date = week_ago + timedelta(days=i)
+        dates.append(date)
+        amounts.append(date_totals.get(date, 0))
+    
+    # Imported here so Pillow is only loaded when a chart is drawn
+    from .charts import render_daily_chart
+    buf = io.BytesIO()
+    render_daily_chart(dates, amounts, buf)
+    data = buf.getvalue()
+    cache.set(CHART_CACHE_KEY, (chart_key, data), 3600)
+    
+    return HttpResponse(data, content_type='image/png')
+
+
 def expense_prediction(request):
     """
     Display AI spending prediction.
@@ -221,7 +225,11 @@ def expense_prediction(request):
     - Shows explanation of how it works
     """
     expenses = Expense.objects.all()
-    predictor = ExpensePredictor()
+    predictor = get_predictor()
+    
+    # Count and date range of the data in a single query
+    stats = expenses.aggregate(cnt=Count('id'), first=Min('date'), last=Max('date'))
+    expense_count = stats['cnt']
     
     # Check if user wants to retrain
     if request.GET.get('retrain') == '1':
@@ -230,8 +238,14 @@ def expense_prediction(request):
             messages.success(request, 'Model retrained successfully!')
         else:
             messages.warning(request, result.get('error', 'Could not train model'))
-    else:
+    elif expense_count > 0:
         result = predictor.predict_next_day(expenses)
+    else:
+        result = {
+            'success': False,
+            'error': 'No expense data available',
+            'prediction': None
+        }
     
     # Get model info
     model_info = predictor.get_model_info()
@@ -239,14 +253,9 @@ def expense_prediction(request):
     # Get explanation
     explanation = get_prediction_explanation()
     
-    # Calculate some stats
-    expense_count = expenses.count()
-    
     # Get date range of data
     if expense_count > 0:
-        first_expense = expenses.order_by('date').first()
-        last_expense = expenses.order_by('-date').first()
-        date_range = f"{first_expense.date.strftime('%b %d')} - {last_expense.date.strftime('%b %d, %Y')}"
+        date_range = f"{stats['first'].strftime('%b %d')} - {stats['last'].strftime('%b %d, %Y')}"
     else:
         date_range = "No data"
     
@@ -267,6 +276,51 @@ def expense_prediction(request):
     return render(request, 'expense_prediction.html', context)
 
 
+def _draw_sample_rows_numpy(num_days, categories, amount_ranges):
+    """
+    Draw the sample expenses with NumPy, all random values at once.
+    
+    Returns:
+        list: (day index, category index, description index, amount) tuples
+    """
+    import numpy as np
+    
+    rng = np.random.default_rng()
+    counts = rng.integers(1, 5, size=num_days)  # 1-4 expenses per day
+    total = int(counts.sum())
+    date_idx = np.repeat(np.arange(num_days), counts)
+    category_idx = rng.integers(0, len(categories), size=total)
+    description_idx = rng.integers(0, 5, size=total)  # 5 descriptions per category
+    
+    # Amount range for each drawn category
+    mins = np.array([amount_ranges[c][0] for c in categories])[category_idx]
+    maxs = np.array([amount_ranges[c][1] for c in categories])[category_idx]
+    amounts = np.round(rng.uniform(mins, maxs), 2)
+    
+    return list(zip(date_idx.tolist(), category_idx.tolist(),
+                    description_idx.tolist(), amounts.tolist()))
+
+
+def _draw_sample_rows_random(num_days, categories, amount_ranges):
+    """
+    Draw the sample expenses with the standard random module (no NumPy needed).
+    
+    Returns:
+        list: (day index, category index, description index, amount) tuples
+    """
+    import random
+    
+    rows = []
+    for d in range(num_days):
+        # Random number of expenses per day (1-4)
+        for _ in range(random.randint(1, 4)):
+            c = random.randrange(len(categories))
+            min_amt, max_amt = amount_ranges[categories[c]]
+            amount = round(random.uniform(min_amt, max_amt), 2)
+            rows.append((d, c, random.randrange(5), amount))
+    return rows
+
+
 def populate_sample_data(request):
     """
     Populate the database with sample expense data for demonstration.
@@ -274,8 +328,6 @@ def populate_sample_data(request):
     This creates realistic sample expenses over the past 30 days
     to demonstrate the system's features.
     """
-    import random
-    
     # Check if data already exists
     if Expense.objects.count() > 0:
         messages.warning(request, 'Sample data already exists. Clear existing data first if you want to repopulate.')
@@ -301,30 +353,34 @@ def populate_sample_data(request):
     }
     
     # Generate expenses for the past 30 days
-    today = datetime.now().date()
-    expenses_created = 0
+    today = timezone.localdate()
+    dates = tuple(today - timedelta(days=days_ago) for days_ago in range(30))
     
-    for days_ago in range(30):
-        date = today - timedelta(days=days_ago)
-        
-        # Random number of expenses per day (1-4)
-        num_expenses = random.randint(1, 4)
-        
-        for _ in range(num_expenses):
-            category = random.choice(categories)
-            min_amt, max_amt = amount_ranges[category]
-            amount = round(random.uniform(min_amt, max_amt), 2)
-            description = random.choice(descriptions[category])
-            
-            Expense.objects.create(
-                amount=Decimal(str(amount)),
-                category=category,
-                date=date,
-                description=description
-            )
-            expenses_created += 1
-    
-    messages.success(request, f'Successfully created {expenses_created} sample expenses!')
+    # Pick a date, category, description and amount for every expense
+    if ML_AVAILABLE:
+        rows = _draw_sample_rows_numpy(len(dates), categories, amount_ranges)
+    else:
+        rows = _draw_sample_rows_random(len(dates), categories, amount_ranges)
+    
+    expenses = []
+    for d, c, k, amount in rows:
+        category = categories[c]
+        expenses.append(Expense(
+            amount=Decimal(str(amount)),
+            category=category,
+            date=dates[d],
+            description=descriptions[category][k]
+        ))
+    
+    # Insert everything in one transaction with multi-row INSERTs
+    with transaction.atomic():
+        Expense.objects.bulk_create(expenses, batch_size=500)
+    
+    # bulk_create() does not send post_save, so the ML model can't be
+    # updated row by row; reset it so it is retrained from the new data
+    get_predictor().reset()
+    
+    messages.success(request, f'Successfully created {len(expenses)} sample expenses!')
     return redirect('expense_list')
 
 
@@ -335,12 +391,11 @@ def clear_data(request):
     This is useful for resetting the demo or starting fresh.
     """
     if request.method == 'POST':
-        count = Expense.objects.count()
-        Expense.objects.all().delete()
-        
-        # Also delete the ML model file
-        if os.path.exists(settings.ML_MODEL_PATH):
-            os.remove(settings.ML_MODEL_PATH)
+        with transaction.atomic():
+            # Reset the ML model first, so the post_delete receiver has no
+            # model to update for each deleted row
+            get_predictor().reset()
+            count, _ = Expense.objects.all().delete()
         
         messages.success(request, f'Cleared {count} expenses and reset the ML model.')
         return redirect('expense_list')
@@ -352,12 +407,14 @@ def expense_delete(request, pk):
     """
     Delete a single expense.
     """
-    try:
-        expense = Expense.objects.get(pk=pk)
-        amount = expense.amount
+    # One fetch; the row is needed anyway because the post_delete receivers
+    # prevent Django from deleting without loading it
+    expense = Expense.objects.filter(pk=pk).first()
+    
+    if expense is not None:
         expense.delete()
-        messages.success(request, f'Expense of ₱{amount} deleted successfully!')
-    except Expense.DoesNotExist:
+        messages.success(request, f'Expense of ₱{expense.amount} deleted successfully!')
+    else:
         messages.error(request, 'Expense not found.')
     
     return redirect('expense_list')
\ No newline at end of file
@@ -76,9 +76,6 @@ if errorlevel 1 (
 )
 echo       Database ready!
 
-REM Create static directories if they don't exist
-if not exist "static\charts" mkdir static\charts
-
 echo [6/6] Starting server...
 echo.
 echo  ============================================